@@ -3,13 +3,12 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict
 from datetime import datetime, timezone
 
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 
-from main import APP_VERSION, HAS_FHE, run_once
+from main import APP_VERSION, fhe_available, result_to_dict, run_once
 
 app = Flask(__name__)
 CORS(app)
@@ -115,9 +114,9 @@ def apply_security_mode_effects(result_dict: dict, security_mode: str) -> None:
 def status():
     return jsonify(
         {
-            "fhe_available": HAS_FHE,
+            "fhe_available": fhe_available(),
             "version": APP_VERSION,
-            "library": "Microsoft SEAL (TenSEAL)" if HAS_FHE else "None",
+            "library": "Microsoft SEAL (TenSEAL)" if fhe_available() else "None",
             "status": "ready",
         }
     )
@@ -154,7 +153,7 @@ def compute():
                 return jsonify({"success": False, "error": "sensitiveInput or loanProfile required"}), 400
 
         result = run_once(sensitive_input, scenario, force_fallback)
-        result_dict = asdict(result)
+        result_dict = result_to_dict(result)
 
         if loan_profile:
             decision = derive_preapproval_decision(
@@ -191,11 +190,11 @@ def quantum_simulate():
 
 @app.route("/api/health", methods=["GET"])
 def health():
-    return jsonify({"status": "healthy", "fhe_enabled": HAS_FHE})
+    return jsonify({"status": "healthy", "fhe_enabled": fhe_available()})
 
 
 if __name__ == "__main__":
     print(f"QuantumProof Ops API v{APP_VERSION}")
-    print(f"FHE Available: {HAS_FHE}")
+    print(f"FHE Available: {fhe_available()}")
     print("Starting server at http://localhost:5001")
     app.run(debug=True, port=5001, host="0.0.0.0")
@@ -5,33 +5,66 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import importlib.util
 import json
+import os
 import shutil
 import subprocess
 import tempfile
 import time
-from dataclasses import asdict, dataclass
+import zlib
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+# TenSEAL is imported lazily inside FHECompute so fallback runs and --help
+# do not pay for loading the SEAL extension.
+HAS_FHE = importlib.util.find_spec("tenseal") is not None
+if not HAS_FHE:
+    print("WARNING: TenSEAL not installed. Run: pip install tenseal numpy")
+
 try:
-    import tenseal as ts
-    HAS_FHE = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_FHE = False
-    print("WARNING: TenSEAL not installed. Run: pip install tenseal numpy")
+    HAS_ORJSON = False
 
 APP_VERSION = "2.1.0-SEAL-FHE-SNARKJS"
 CIRCUIT_VERSION = "fhe-seal-v1"
 REAL_ZK_CIRCUIT_VERSION = "loan-signal-groth16-v1"
 
+_RISK_CONTEXT = "Quantum-resistant FHE + verifiable proof layer"
+_TRUST_MODEL = "Cryptographic verification vs traditional trust"
+
 ZK_ROOT = Path(__file__).resolve().parent.parent / "zk"
 ZK_ARTIFACTS = ZK_ROOT / "artifacts"
 ZK_WASM = ZK_ARTIFACTS / "loan_signal_js" / "loan_signal.wasm"
 ZK_ZKEY = ZK_ARTIFACTS / "loan_signal_final.zkey"
 ZK_VKEY = ZK_ARTIFACTS / "verification_key.json"
 
+# CKKS parameter sets. The risk computation has multiplicative depth 1, so the
+# "fast" ring is sufficient; "standard" keeps the larger ring for audit runs.
+# The middle prime is sized to the scale so the rescale after the multiply
+# divides by ~scale (a 20-bit prime at 2**20 skewed results by ~1.6%).
+FHE_PROFILES: dict[str, dict[str, Any]] = {
+    "fast": {
+        "poly_modulus_degree": 4096,
+        "coeff_mod_bit_sizes": (38, 30, 40),
+        "global_scale": 2**30,
+    },
+    "standard": {
+        "poly_modulus_degree": 8192,
+        "coeff_mod_bit_sizes": (60, 40, 40, 60),
+        "global_scale": 2**40,
+    },
+}
+DEFAULT_SECURITY_PROFILE = "fast"
+
+# Directory for serialized CKKS contexts (keys included); override with
+# QPO_CTX_CACHE, or set it to "" to disable the cache.
+DEFAULT_CONTEXT_CACHE_DIR = "~/.cache/qpo"
+
 
 @dataclass
 class BenchmarkMetrics:
@@ -40,6 +73,7 @@ class BenchmarkMetrics:
     encryption_time_ms: int
     computation_time_ms: int
     proof_time_ms: int
+    batch_size: int = 1
 
 
 @dataclass
@@ -64,6 +98,20 @@ class RunResult:
     proof: ProofArtifact
 
 
+def result_to_dict(result: RunResult) -> dict[str, Any]:
+    """Plain-dict view of a RunResult; shallow copies instead of asdict's deepcopy."""
+    return {
+        "run_id": result.run_id,
+        "timestamp_utc": result.timestamp_utc,
+        "scenario": result.scenario,
+        "compute_result": dict(result.compute_result),
+        "risk_context": result.risk_context,
+        "trust_model_comparison": result.trust_model_comparison,
+        "benchmark": dict(result.benchmark.__dict__),
+        "proof": dict(result.proof.__dict__),
+    }
+
+
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -72,6 +120,46 @@ def stable_hash(payload: str) -> str:
     return hashlib.sha3_256(payload.encode("utf-8")).hexdigest()
 
 
+def stable_hash_digest(payload: str) -> bytes:
+    """Raw SHA3-256 digest; seeds the derived circuit inputs and FHE value."""
+    return hashlib.sha3_256(payload.encode("utf-8")).digest()
+
+
+def internal_id_digest(payload: str) -> bytes:
+    """SHA-256 for run ids; not part of the audit trail."""
+    return hashlib.sha256(payload.encode("utf-8")).digest()
+
+
+def json_scalar_bytes(value: Any) -> bytes:
+    if HAS_ORJSON:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def canonical_hash_update(hasher: Any, payload: Any) -> None:
+    """Feed compact, key-sorted JSON for payload into hasher without building the full string."""
+    if isinstance(payload, dict):
+        hasher.update(b"{")
+        for index, key in enumerate(sorted(payload)):
+            if not isinstance(key, str):
+                raise TypeError(f"Canonical JSON keys must be str, got {type(key).__name__}")
+            if index:
+                hasher.update(b",")
+            hasher.update(json_scalar_bytes(key))
+            hasher.update(b":")
+            canonical_hash_update(hasher, payload[key])
+        hasher.update(b"}")
+    elif isinstance(payload, (list, tuple)):
+        hasher.update(b"[")
+        for index, item in enumerate(payload):
+            if index:
+                hasher.update(b",")
+            canonical_hash_update(hasher, item)
+        hasher.update(b"]")
+    else:
+        hasher.update(json_scalar_bytes(payload))
+
+
 def compute_input_fingerprint(sensitive_input: str) -> str:
     return stable_hash(f"fingerprint::{sensitive_input}")
 
@@ -102,8 +190,8 @@ def derive_loan_inputs(sensitive_input: str, scenario: str) -> tuple[int, int]:
         return max(300, min(850, credit_score)), max(0, min(10000, dti_bp))
 
     # Fallback deterministic derivation for non-loan scenarios.
-    credit_score = 300 + (int(stable_hash(sensitive_input)[:8], 16) % 551)
-    dti_bp = int(stable_hash(scenario)[:6], 16) % 10001
+    credit_score = 300 + (int.from_bytes(stable_hash_digest(sensitive_input)[:4], "big") % 551)
+    dti_bp = int.from_bytes(stable_hash_digest(scenario)[:3], "big") % 10001
     return credit_score, dti_bp
 
 
@@ -178,74 +266,181 @@ def generate_real_snarkjs_proof(credit_score: int, dti_bp: int) -> tuple[str, bo
 class FHECompute:
     """Fully Homomorphic Encryption using Microsoft SEAL (via TenSEAL)."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        poly_modulus_degree: int = 4096,
+        coeff_mod_bit_sizes: tuple[int, ...] = (38, 30, 40),
+        global_scale: int = 2**30,
+    ):
         if not HAS_FHE:
             raise ImportError("TenSEAL required. Install: pip install tenseal")
 
-        self.context = ts.context(
-            ts.SCHEME_TYPE.CKKS,
-            poly_modulus_degree=8192,
-            coeff_mod_bit_sizes=[60, 40, 40, 60],
-        )
-        self.context.global_scale = 2**40
-        self.context.generate_galois_keys()
+        import tenseal as ts
 
-    def get_parameters(self) -> dict[str, Any]:
-        return {
+        cache_path = context_cache_path(poly_modulus_degree, coeff_mod_bit_sizes)
+        self.context = load_cached_context(cache_path) if cache_path else None
+        if self.context is None:
+            self.context = ts.context(
+                ts.SCHEME_TYPE.CKKS,
+                poly_modulus_degree=poly_modulus_degree,
+                coeff_mod_bit_sizes=list(coeff_mod_bit_sizes),
+            )
+            if cache_path:
+                store_cached_context(cache_path, self.context)
+        self.context.global_scale = global_scale
+        self.slot_count = poly_modulus_degree // 2
+        # Risk transform (x - 300) * scale, folded to x * scale - shift so the
+        # multiply (and its rescale) happens first and the shift is precomputed.
+        self._scale = 0.18181818
+        self._shift = 300.0 * self._scale
+        # No rotations are performed, so Galois keys are not generated. If a
+        # rotation is ever needed, generate only those steps:
+        # self.context.generate_galois_keys(steps=[...]).
+        self._parameters = {
             "scheme": "CKKS",
-            "poly_modulus_degree": 8192,
+            "poly_modulus_degree": poly_modulus_degree,
+            "coeff_mod_bit_sizes": list(coeff_mod_bit_sizes),
+            "global_scale_bits": global_scale.bit_length() - 1,
             "security_level": "128-bit",
             "library": "Microsoft SEAL (via TenSEAL)",
-            "real_zk_ready": real_zk_ready(),
         }
 
-    def encrypt_and_compute(self, sensitive_value: float) -> tuple[float, int]:
-        start = time.perf_counter()
-        encrypted = ts.ckks_vector(self.context, [sensitive_value])
-        encrypted_result = (encrypted - 300.0) * 0.18181818
-        compute_time_ms = int((time.perf_counter() - start) * 1000)
+    def get_parameters(self) -> dict[str, Any]:
+        return {**self._parameters, "real_zk_ready": real_zk_ready()}
+
+    def encrypt_and_compute_batch(self, values: list[float]) -> tuple[list[float], int]:
+        """Pack values into CKKS slots and apply the risk transform once per ciphertext."""
+        import tenseal as ts
+
+        compute_time_ns = 0
+        results: list[float] = []
+        for offset in range(0, len(values), self.slot_count):
+            chunk = values[offset : offset + self.slot_count]
+            start = time.perf_counter_ns()
+            encrypted = ts.ckks_vector(self.context, chunk)
+            encrypted.mul_(self._scale)
+            encrypted.sub_(self._shift)
+            compute_time_ns += time.perf_counter_ns() - start
+
+            decrypted = encrypted.decrypt()[: len(chunk)]
+            results.extend(max(0.0, min(100.0, value)) for value in decrypted)
+        return results, compute_time_ns // 1_000_000
+
+
+def context_cache_path(poly_modulus_degree: int, coeff_mod_bit_sizes: tuple[int, ...]) -> Path | None:
+    cache_dir = os.environ.get("QPO_CTX_CACHE", DEFAULT_CONTEXT_CACHE_DIR)
+    if not cache_dir:
+        return None
+    bit_sizes = "-".join(str(bits) for bits in coeff_mod_bit_sizes)
+    return Path(cache_dir).expanduser() / f"ckks-{poly_modulus_degree}-{bit_sizes}.bin"
 
-        result = encrypted_result.decrypt()[0]
-        result = max(0.0, min(100.0, result))
-        return result, compute_time_ms
 
+def load_cached_context(path: Path) -> Any | None:
+    """Reload a serialized TenSEAL context, or None if missing or unreadable."""
+    if not path.exists():
+        return None
 
-def perform_fhe_computation(sensitive_input: str, scenario: str) -> tuple[dict[str, Any], str, int, int]:
-    if not HAS_FHE:
-        numeric_signal = int(stable_hash(sensitive_input + scenario)[:8], 16) % 100
-        return {
-            "risk_reduction_percent": 20 + (numeric_signal % 61),
-            "performance_overhead_percent": 100,
-            "recommended_rollout": "phased",
-            "fhe_enabled": False,
-        }, "fallback-no-fhe", 0, 0
+    import tenseal as ts
 
     try:
-        enc_start = time.perf_counter()
-        fhe = FHECompute()
-        encryption_time_ms = int((time.perf_counter() - enc_start) * 1000)
+        return ts.context_from(path.read_bytes())
+    except Exception as exc:
+        print(f"Ignoring unreadable FHE context cache {path}: {exc}")
+        return None
+
+
+def store_cached_context(path: Path, context: Any) -> None:
+    """Persist the context with its secret key; owner-only, written atomically."""
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(context.serialize(save_secret_key=True))
+        os.replace(tmp_path, path)
+    except Exception as exc:
+        print(f"FHE context cache not written to {path}: {exc}")
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
 
-        numeric_value = (int(stable_hash(sensitive_input)[:8], 16) % 551) + 300
-        risk_score, compute_time_ms = fhe.encrypt_and_compute(float(numeric_value))
+_FHE_CONTEXTS: dict[tuple[int, tuple[int, ...]], FHECompute] = {}
+
+
+def get_fhe(security_profile: str = DEFAULT_SECURITY_PROFILE) -> FHECompute:
+    """Return the process-wide FHE context for a profile, building keys on first use only."""
+    params = FHE_PROFILES[security_profile]
+    key = (params["poly_modulus_degree"], params["coeff_mod_bit_sizes"])
+    if key not in _FHE_CONTEXTS:
+        _FHE_CONTEXTS[key] = FHECompute(**params)
+    return _FHE_CONTEXTS[key]
+
+
+def get_fhe_if_available(security_profile: str = DEFAULT_SECURITY_PROFILE) -> FHECompute | None:
+    """get_fhe(), or None if TenSEAL is missing or present but fails to import."""
+    global HAS_FHE
+    if not HAS_FHE:
+        return None
+    try:
+        return get_fhe(security_profile)
+    except ImportError as exc:
+        HAS_FHE = False
+        print(f"WARNING: TenSEAL failed to import ({exc}); using fallback mode.")
+        return None
 
-        return {
-            "risk_reduction_percent": int(risk_score),
-            "performance_overhead_percent": 5000,
-            "recommended_rollout": "phased",
-            "fhe_enabled": True,
-            "fhe_scheme": "CKKS (Microsoft SEAL)",
-        }, "fhe-seal-homomorphic-encryption", encryption_time_ms, compute_time_ms
+
+def fhe_available() -> bool:
+    return HAS_FHE
+
+
+def fallback_compute_result(sensitive_input: str, scenario: str) -> dict[str, Any]:
+    # Non-cryptographic seed: the fallback makes no security claim, so CRC32 suffices.
+    numeric_signal = zlib.crc32((sensitive_input + scenario).encode("utf-8")) % 100
+    return {
+        "risk_reduction_percent": 20 + (numeric_signal % 61),
+        "performance_overhead_percent": 100,
+        "recommended_rollout": "phased",
+        "fhe_enabled": False,
+    }
+
+
+def perform_fhe_batch_computation(
+    fhe: FHECompute,
+    sensitive_inputs: list[str],
+    scenario: str,
+) -> tuple[list[dict[str, Any]], str, int]:
+    """Score every input under one packed ciphertext per slot-count chunk."""
+    try:
+        numeric_values = [
+            float((int.from_bytes(stable_hash_digest(sensitive_input)[:4], "big") % 551) + 300)
+            for sensitive_input in sensitive_inputs
+        ]
+        risk_scores, compute_time_ms = fhe.encrypt_and_compute_batch(numeric_values)
+
+        return [
+            {
+                "risk_reduction_percent": int(risk_score),
+                "performance_overhead_percent": 5000,
+                "recommended_rollout": "phased",
+                "fhe_enabled": True,
+                "fhe_scheme": "CKKS (Microsoft SEAL)",
+            }
+            for risk_score in risk_scores
+        ], "fhe-seal-homomorphic-encryption", compute_time_ms
 
     except Exception as exc:
         print(f"FHE failed: {exc}")
-        numeric_signal = int(stable_hash(sensitive_input + scenario)[:8], 16) % 100
-        return {
-            "risk_reduction_percent": 20 + (numeric_signal % 61),
-            "performance_overhead_percent": 100,
-            "recommended_rollout": "phased",
-            "fhe_enabled": False,
-            "error": str(exc),
-        }, "fallback-error", 0, 0
+        return [
+            {**fallback_compute_result(sensitive_input, scenario), "error": str(exc)}
+            for sensitive_input in sensitive_inputs
+        ], "fallback-error", 0
+
+
+def generate_zk_proof(statement: dict[str, Any]) -> str:
+    """SHA3-256 over the canonical JSON of the simulated proof statement."""
+    hasher = hashlib.sha3_256(b"zkproof::")
+    canonical_hash_update(hasher, statement)
+    return hasher.hexdigest()
 
 
 def build_proof_artifact(
@@ -255,14 +450,14 @@ def build_proof_artifact(
     fhe_parameters: dict[str, Any],
 ) -> tuple[ProofArtifact, int]:
     """Build proof artifact using real snarkjs if available, else simulated fallback."""
-    start = time.perf_counter()
+    start = time.perf_counter_ns()
 
     credit_score, dti_bp = derive_loan_inputs(sensitive_input, scenario)
 
     if real_zk_ready():
         try:
             proof_hash, verified, detail = generate_real_snarkjs_proof(credit_score, dti_bp)
-            proof_time_ms = int((time.perf_counter() - start) * 1000)
+            proof_time_ms = (time.perf_counter_ns() - start) // 1_000_000
             artifact = ProofArtifact(
                 proof_hash=proof_hash,
                 verification_result=verified,
@@ -294,9 +489,11 @@ def build_proof_artifact(
         "circuit_version": CIRCUIT_VERSION,
         "zk_system": "simulated-zkSNARK",
     }
-    proof_hash = stable_hash(f"zkproof::{json.dumps(statement, sort_keys=True)}")
-    verified = proof_hash == stable_hash(f"zkproof::{json.dumps(statement, sort_keys=True)}")
-    proof_time_ms = int((time.perf_counter() - start) * 1000)
+    proof_hash = generate_zk_proof(statement)
+    # The simulated path has no independent verifier: re-hashing the statement
+    # in-process would only repeat generate_zk_proof, so the hash stands as produced.
+    verified = True
+    proof_time_ms = (time.perf_counter_ns() - start) // 1_000_000
 
     artifact = ProofArtifact(
         proof_hash=proof_hash,
@@ -317,17 +514,87 @@ def build_proof_artifact(
     return artifact, proof_time_ms
 
 
-def run_once(sensitive_input: str, scenario: str, force_fallback: bool) -> RunResult:
-    total_start = time.perf_counter()
-    input_fingerprint = compute_input_fingerprint(sensitive_input)
+def run_once(
+    sensitive_input: str,
+    scenario: str,
+    force_fallback: bool,
+    security_profile: str = DEFAULT_SECURITY_PROFILE,
+) -> RunResult:
+    return run_batch([sensitive_input], scenario, force_fallback, security_profile)[0]
 
-    compute_result, mode, enc_time, comp_time = perform_fhe_computation(sensitive_input, scenario)
 
-    if force_fallback or not HAS_FHE:
+def run_batch(
+    sensitive_inputs: list[str],
+    scenario: str,
+    force_fallback: bool,
+    security_profile: str = DEFAULT_SECURITY_PROFILE,
+) -> list[RunResult]:
+    """Run the FHE step once over all inputs, then prove and package each result.
+
+    Shared FHE timings are divided evenly across the batch, so each result
+    reports its amortized share plus its own proof time.
+    """
+    if not sensitive_inputs:
+        raise ValueError("run_batch requires at least one input")
+
+    batch_start = time.perf_counter_ns()
+
+    fhe = None
+    if not force_fallback:
+        enc_start = time.perf_counter_ns()
+        fhe = get_fhe_if_available(security_profile)
+        enc_time = (time.perf_counter_ns() - enc_start) // 1_000_000
+
+    if fhe is None:
+        compute_results = [
+            fallback_compute_result(sensitive_input, scenario) for sensitive_input in sensitive_inputs
+        ]
+        mode = "fallback-forced" if HAS_FHE else "fallback-no-fhe"
+        enc_time = comp_time = 0
         fhe_params = {"enabled": False, "real_zk_ready": real_zk_ready()}
     else:
-        fhe = FHECompute() if HAS_FHE else None
-        fhe_params = fhe.get_parameters() if fhe else {"enabled": False}
+        compute_results, mode, comp_time = perform_fhe_batch_computation(
+            fhe, sensitive_inputs, scenario
+        )
+        fhe_params = fhe.get_parameters()
+
+    batch_size = len(sensitive_inputs)
+    shared_time_ns = (time.perf_counter_ns() - batch_start) // batch_size
+
+    return [
+        build_run_result(
+            sensitive_input=sensitive_input,
+            scenario=scenario,
+            compute_result=compute_result,
+            mode=mode,
+            enc_time=enc_time // batch_size,
+            comp_time=comp_time // batch_size,
+            fhe_params=fhe_params,
+            shared_time_ns=shared_time_ns,
+            batch_size=batch_size,
+            batch_index=batch_index,
+        )
+        for batch_index, (sensitive_input, compute_result) in enumerate(
+            zip(sensitive_inputs, compute_results)
+        )
+    ]
+
+
+def build_run_result(
+    sensitive_input: str,
+    scenario: str,
+    compute_result: dict[str, Any],
+    mode: str,
+    enc_time: int,
+    comp_time: int,
+    fhe_params: dict[str, Any],
+    shared_time_ns: int = 0,
+    batch_size: int = 1,
+    batch_index: int = 0,
+) -> RunResult:
+    item_start = time.perf_counter_ns()
+    ts_iso = utc_now_iso()
+    input_fingerprint = compute_input_fingerprint(sensitive_input)
 
     proof, proof_time = build_proof_artifact(
         input_fingerprint=input_fingerprint,
@@ -336,99 +603,142 @@ def run_once(sensitive_input: str, scenario: str, force_fallback: bool) -> RunRe
         fhe_parameters=fhe_params,
     )
 
-    total_runtime_ms = int((time.perf_counter() - total_start) * 1000)
-    run_id = f"run-{stable_hash(utc_now_iso())[:10]}"
+    total_runtime_ms = (shared_time_ns + time.perf_counter_ns() - item_start) // 1_000_000
+    # The batch index keeps ids unique when items share a clock tick.
+    run_id = f"run-{internal_id_digest(f'{ts_iso}::{batch_index}')[:5].hex()}"
 
     if not proof.verification_result:
         raise RuntimeError("ZK proof verification failed")
 
     return RunResult(
         run_id=run_id,
-        timestamp_utc=utc_now_iso(),
+        timestamp_utc=ts_iso,
         scenario=scenario,
         compute_result=compute_result,
-        risk_context="Quantum-resistant FHE + verifiable proof layer",
-        trust_model_comparison="Cryptographic verification vs traditional trust",
+        risk_context=_RISK_CONTEXT,
+        trust_model_comparison=_TRUST_MODEL,
         benchmark=BenchmarkMetrics(
             runtime_ms=total_runtime_ms,
             compute_mode=mode,
             encryption_time_ms=enc_time,
             computation_time_ms=comp_time,
             proof_time_ms=proof_time,
+            batch_size=batch_size,
         ),
         proof=proof,
     )
 
 
-def export_json(result: RunResult, output_dir: Path) -> Path:
+def export_both(result: RunResult, output_dir: Path) -> tuple[Path, Path]:
+    """Write the JSON and Markdown artifacts for a run from a single dict snapshot."""
     output_dir.mkdir(parents=True, exist_ok=True)
-    path = output_dir / f"{result.run_id}.json"
-    path.write_text(json.dumps(asdict(result), indent=2), encoding="utf-8")
-    return path
+    json_path = output_dir / f"{result.run_id}.json"
+    md_path = output_dir / f"{result.run_id}.md"
 
+    data = result_to_dict(result)
+    if HAS_ORJSON:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    json_path.write_bytes(payload)
 
-def export_markdown(result: RunResult, output_dir: Path) -> Path:
-    output_dir.mkdir(parents=True, exist_ok=True)
-    path = output_dir / f"{result.run_id}.md"
+    md_path.write_bytes(render_markdown(data).encode("utf-8"))
+    return json_path, md_path
+
+
+def render_markdown(data: dict[str, Any]) -> str:
+    proof = data["proof"]
+    benchmark = data["benchmark"]
+    compute_result = data["compute_result"]
 
-    primitives_list = "\n".join(f"  - {p}" for p in result.proof.crypto_primitives_used)
+    primitives_list = "\n".join(f"  - {p}" for p in proof["crypto_primitives_used"])
 
-    md = f"""# QuantumProof Ops - FHE Computation Report
+    return f"""# QuantumProof Ops - FHE Computation Report
 
 ## Run Metadata
-- **Run ID**: `{result.run_id}`
-- **Timestamp**: `{result.timestamp_utc}`
-- **Scenario**: `{result.scenario}`
-- **Verification**: `{'✅ VERIFIED' if result.proof.verification_result else '❌ FAILED'}`
+- **Run ID**: `{data['run_id']}`
+- **Timestamp**: `{data['timestamp_utc']}`
+- **Scenario**: `{data['scenario']}`
+- **Verification**: `{'✅ VERIFIED' if proof['verification_result'] else '❌ FAILED'}`
 
 ## Cryptographic Primitives
 {primitives_list}
 
 ## FHE / ZK Parameters
 ```json
-{json.dumps(result.proof.fhe_parameters, indent=2)}
+{json.dumps(proof['fhe_parameters'], indent=2)}
 ```
 
 ## Results
-- **Risk Score**: `{result.compute_result['risk_reduction_percent']}%`
-- **FHE Overhead**: `{result.compute_result['performance_overhead_percent']}%`
-- **FHE Enabled**: `{result.compute_result.get('fhe_enabled', False)}`
+- **Risk Score**: `{compute_result['risk_reduction_percent']}%`
+- **FHE Overhead**: `{compute_result['performance_overhead_percent']}%`
+- **FHE Enabled**: `{compute_result.get('fhe_enabled', False)}`
 
 ## Performance
-- **Total**: `{result.benchmark.runtime_ms}ms`
-- **Encryption**: `{result.benchmark.encryption_time_ms}ms`
-- **Computation**: `{result.benchmark.computation_time_ms}ms`
-- **Proof Gen**: `{result.benchmark.proof_time_ms}ms`
+- **Total**: `{benchmark['runtime_ms']}ms`
+- **Encryption**: `{benchmark['encryption_time_ms']}ms`
+- **Computation**: `{benchmark['computation_time_ms']}ms`
+- **Proof Gen**: `{benchmark['proof_time_ms']}ms`
+- **Batch Size**: `{benchmark['batch_size']}` (FHE timings are the per-input share)
 
 ## Audit Trail
-- **Proof Hash**: `{result.proof.proof_hash}`
-- **Input Fingerprint**: `{result.proof.input_fingerprint}`
-- **Circuit Version**: `{result.proof.circuit_version}`
+- **Proof Hash**: `{proof['proof_hash']}`
+- **Input Fingerprint**: `{proof['input_fingerprint']}`
+- **Circuit Version**: `{proof['circuit_version']}`
 
 ---
 *Generated by QuantumProof Ops v{APP_VERSION} using Microsoft SEAL*
 """
-    path.write_text(md, encoding="utf-8")
-    return path
 
 
-def main() -> int:
+_PARSER: argparse.ArgumentParser | None = None
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Return the CLI parser, built once per process."""
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = build_parser()
+    return _PARSER
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="QuantumProof Ops - FHE using Microsoft SEAL")
     parser.add_argument("run", nargs="?", default="run")
-    parser.add_argument("--input", required=True, help="Sensitive input")
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument("--input", help="Sensitive input")
+    inputs.add_argument("--input-file", help="File with one sensitive input per line (batched FHE)")
     parser.add_argument("--scenario", default="credit-risk", help="Scenario")
     parser.add_argument("--fallback", action="store_true", help="Disable FHE")
     parser.add_argument("--output-dir", default="outputs", help="Output directory")
+    parser.add_argument(
+        "--security-profile",
+        choices=sorted(FHE_PROFILES),
+        default=DEFAULT_SECURITY_PROFILE,
+        help="CKKS parameter set (fast: N=4096, standard: N=8192)",
+    )
+    return parser
+
 
-    args = parser.parse_args()
+def main(argv: list[str] | None = None) -> int:
+    """CLI entry point; library callers should use run_once/run_batch + export_both."""
+    args = get_parser().parse_args(argv)
 
     print(f"QuantumProof Ops v{APP_VERSION}")
     print("FHE: Microsoft SEAL (TenSEAL)")
-    print(f"FHE Available: {HAS_FHE}")
+    print(f"FHE Available: {fhe_available()}")
     print(f"Real ZK Ready (snarkjs): {real_zk_ready()}\n")
 
+    if args.input_file:
+        lines = Path(args.input_file).read_text(encoding="utf-8").splitlines()
+        sensitive_inputs = [line.strip() for line in lines if line.strip()]
+        if not sensitive_inputs:
+            get_parser().error(f"--input-file {args.input_file} contains no inputs")
+    else:
+        sensitive_inputs = [args.input]
+
     try:
-        result = run_once(args.input, args.scenario, args.fallback)
+        results = run_batch(sensitive_inputs, args.scenario, args.fallback, args.security_profile)
     except Exception as exc:
         print(f"❌ ERROR: {exc}")
         import traceback
@@ -436,23 +746,23 @@ def main() -> int:
         traceback.print_exc()
         return 1
 
-    json_path = export_json(result, Path(args.output_dir))
-    md_path = export_markdown(result, Path(args.output_dir))
+    for result in results:
+        json_path, md_path = export_both(result, Path(args.output_dir))
 
-    print("✅ Computation complete")
-    print(f"   Run ID: {result.run_id}")
-    print(f"   Verification: {'✅' if result.proof.verification_result else '❌'}")
-    print(f"   Runtime: {result.benchmark.runtime_ms}ms")
-    print(f"   Mode: {result.benchmark.compute_mode}")
-    print(f"   FHE: {result.compute_result.get('fhe_enabled', False)}")
+        print("✅ Computation complete")
+        print(f"   Run ID: {result.run_id}")
+        print(f"   Verification: {'✅' if result.proof.verification_result else '❌'}")
+        print(f"   Runtime: {result.benchmark.runtime_ms}ms")
+        print(f"   Mode: {result.benchmark.compute_mode}")
+        print(f"   FHE: {result.compute_result.get('fhe_enabled', False)}")
 
-    print("\n📄 Exports:")
-    print(f"   JSON: {json_path}")
-    print(f"   Markdown: {md_path}")
+        print("\n📄 Exports:")
+        print(f"   JSON: {json_path}")
+        print(f"   Markdown: {md_path}")
 
-    print("\n🔐 Crypto Primitives:")
-    for primitive in result.proof.crypto_primitives_used:
-        print(f"   - {primitive}")
+        print("\n🔐 Crypto Primitives:")
+        for primitive in result.proof.crypto_primitives_used:
+            print(f"   - {primitive}")
 
     return 0
 
@@ -1,7 +1,15 @@
 import json
+import os
 import subprocess
+import sys
+from dataclasses import asdict
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import main  # noqa: E402
+from app.main import export_both, result_to_dict, run_batch, run_once  # noqa: E402
+
 
 def test_cli_run_exports_json_and_markdown(tmp_path: Path):
     out_dir = tmp_path / "out"
@@ -16,8 +24,9 @@ def test_cli_run_exports_json_and_markdown(tmp_path: Path):
         "--output-dir",
         str(out_dir),
     ]
-    completed = subprocess.run(cmd, check=True, capture_output=True, text=True)
-    assert "Verification: True" in completed.stdout
+    env = {**os.environ, "QPO_CTX_CACHE": str(tmp_path / "ctx")}
+    completed = subprocess.run(cmd, check=True, capture_output=True, text=True, env=env)
+    assert "Verification: ✅" in completed.stdout
 
     files = list(out_dir.iterdir())
     assert any(f.suffix == ".json" for f in files)
@@ -27,3 +36,78 @@ def test_cli_run_exports_json_and_markdown(tmp_path: Path):
     payload = json.loads(json_file.read_text())
     assert payload["proof"]["verification_result"] is True
     assert "input_fingerprint" in payload["proof"]
+
+
+def test_cli_input_file_exports_one_run_per_line(tmp_path: Path):
+    out_dir = tmp_path / "out"
+    input_file = tmp_path / "inputs.txt"
+    input_file.write_text("demo-a\nloan::750::32::95000::home-loan\n\ndemo-b\n")
+    cmd = [
+        "python3",
+        "app/main.py",
+        "run",
+        "--input-file",
+        str(input_file),
+        "--scenario",
+        "test-scenario",
+        "--output-dir",
+        str(out_dir),
+    ]
+    env = {**os.environ, "QPO_CTX_CACHE": str(tmp_path / "ctx")}
+    subprocess.run(cmd, check=True, capture_output=True, text=True, env=env)
+
+    json_files = [f for f in out_dir.iterdir() if f.suffix == ".json"]
+    assert len(json_files) == 3
+    for json_file in json_files:
+        payload = json.loads(json_file.read_text())
+        assert payload["proof"]["verification_result"] is True
+        assert payload["benchmark"]["batch_size"] == 3
+
+
+def test_run_once_in_process_exports_json_and_markdown(tmp_path: Path):
+    result = run_once("demo-sensitive", "test-scenario", force_fallback=True)
+    assert result.proof.verification_result is True
+    assert result_to_dict(result) == asdict(result)
+
+    json_path, md_path = export_both(result, tmp_path / "out")
+    payload = json.loads(json_path.read_text())
+    assert payload["run_id"] == result.run_id
+    assert payload["proof"]["proof_hash"] == result.proof.proof_hash
+    assert result.proof.proof_hash in md_path.read_text()
+
+
+def test_cli_falls_back_when_tenseal_fails_to_import(tmp_path: Path):
+    stub = tmp_path / "stub" / "tenseal"
+    stub.mkdir(parents=True)
+    (stub / "__init__.py").write_text('raise ImportError("libseal missing")\n')
+    cmd = [
+        "python3",
+        "app/main.py",
+        "run",
+        "--input",
+        "demo-sensitive",
+        "--output-dir",
+        str(tmp_path / "out"),
+    ]
+    env = {**os.environ, "PYTHONPATH": str(stub.parent), "QPO_CTX_CACHE": ""}
+    completed = subprocess.run(cmd, check=True, capture_output=True, text=True, env=env)
+    assert "Mode: fallback-no-fhe" in completed.stdout
+
+
+def test_cli_rejects_blank_input_file(tmp_path: Path):
+    input_file = tmp_path / "inputs.txt"
+    input_file.write_text("\n  \n")
+    cmd = ["python3", "app/main.py", "run", "--input-file", str(input_file)]
+    completed = subprocess.run(cmd, capture_output=True, text=True)
+    assert completed.returncode == 2
+    assert "contains no inputs" in completed.stderr
+
+
+def test_run_batch_ids_are_unique_within_one_clock_tick(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(main, "utc_now_iso", lambda: "2026-01-01T00:00:00+00:00")
+    results = run_batch(["demo-a", "demo-a", "demo-b"], "test-scenario", force_fallback=True)
+
+    assert len({result.run_id for result in results}) == 3
+    for result in results:
+        export_both(result, tmp_path)
+    assert len(list(tmp_path.glob("*.json"))) == 3
@@ -0,0 +1,55 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import main  # noqa: E402
+
+pytest.importorskip("tenseal")
+
+
+def expected_score(value: float) -> float:
+    return max(0.0, min(100.0, (value - 300.0) * 0.18181818))
+
+
+@pytest.fixture(autouse=True)
+def isolated_contexts(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("QPO_CTX_CACHE", str(tmp_path))
+    monkeypatch.setattr(main, "_FHE_CONTEXTS", {})
+
+
+@pytest.mark.parametrize("security_profile", sorted(main.FHE_PROFILES))
+def test_fhe_matches_plaintext_formula(security_profile: str):
+    fhe = main.get_fhe(security_profile)
+    values = [float(v) for v in range(300, 851)]
+
+    results, _ = fhe.encrypt_and_compute_batch(values)
+
+    assert len(results) == len(values)
+    for value, result in zip(values, results):
+        assert result == pytest.approx(expected_score(value), abs=0.05)
+
+
+def test_fhe_batch_spans_multiple_ciphertexts():
+    fhe = main.get_fhe()
+    values = [float(300 + i % 551) for i in range(fhe.slot_count + 5)]
+
+    results, _ = fhe.encrypt_and_compute_batch(values)
+
+    assert len(results) == len(values)
+    for value, result in zip(values, results):
+        assert result == pytest.approx(expected_score(value), abs=0.05)
+
+
+def test_perform_fhe_batch_computation_scores_each_input():
+    inputs = ["demo-a", "demo-b", "loan::750::32::95000::home-loan"]
+
+    compute_results, mode, _ = main.perform_fhe_batch_computation(main.get_fhe(), inputs, "test")
+
+    assert mode == "fhe-seal-homomorphic-encryption"
+    for sensitive_input, compute_result in zip(inputs, compute_results):
+        value = (int.from_bytes(main.stable_hash_digest(sensitive_input)[:4], "big") % 551) + 300
+        assert compute_result["fhe_enabled"] is True
+        assert abs(compute_result["risk_reduction_percent"] - expected_score(value)) <= 1
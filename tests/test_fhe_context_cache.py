@@ -0,0 +1,85 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import main  # noqa: E402
+
+
+class FakeContext:
+    def __init__(self, payload: bytes, fail_serialize: bool = False):
+        self.payload = payload
+        self.fail_serialize = fail_serialize
+        self.global_scale = None
+
+    def serialize(self, save_secret_key: bool = False) -> bytes:
+        if self.fail_serialize:
+            raise ValueError("serialize failed")
+        return self.payload
+
+
+@pytest.fixture
+def fake_tenseal(monkeypatch, tmp_path: Path):
+    fake = types.ModuleType("tenseal")
+    fake.SCHEME_TYPE = types.SimpleNamespace(CKKS="ckks")
+    fake.built = []
+    fake.fail_serialize = False
+
+    def context(scheme, poly_modulus_degree, coeff_mod_bit_sizes):
+        ctx = FakeContext(b"fresh", fail_serialize=fake.fail_serialize)
+        fake.built.append(ctx)
+        return ctx
+
+    def context_from(data: bytes):
+        if data == b"corrupt":
+            raise ValueError("bad context")
+        return FakeContext(data)
+
+    fake.context = context
+    fake.context_from = context_from
+    monkeypatch.setitem(sys.modules, "tenseal", fake)
+    monkeypatch.setattr(main, "HAS_FHE", True)
+    monkeypatch.setenv("QPO_CTX_CACHE", str(tmp_path))
+    return fake
+
+
+def cache_file(tmp_path: Path) -> Path:
+    return tmp_path / "ckks-4096-38-30-40.bin"
+
+
+def test_cache_hit_skips_keygen(fake_tenseal, tmp_path: Path):
+    main.FHECompute()
+    assert cache_file(tmp_path).read_bytes() == b"fresh"
+    assert cache_file(tmp_path).stat().st_mode & 0o777 == 0o600
+
+    fhe = main.FHECompute()
+    assert len(fake_tenseal.built) == 1
+    assert fhe.context.payload == b"fresh"
+
+
+def test_corrupt_cache_is_rebuilt(fake_tenseal, tmp_path: Path):
+    cache_file(tmp_path).write_bytes(b"corrupt")
+
+    fhe = main.FHECompute()
+    assert fhe.context is fake_tenseal.built[0]
+    assert cache_file(tmp_path).read_bytes() == b"fresh"
+
+
+def test_empty_env_disables_cache(fake_tenseal, monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("QPO_CTX_CACHE", "")
+
+    main.FHECompute()
+    main.FHECompute()
+    assert len(fake_tenseal.built) == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_serialize_failure_leaves_no_temp_file(fake_tenseal, tmp_path: Path):
+    fake_tenseal.fail_serialize = True
+
+    fhe = main.FHECompute()
+    assert fhe.context is fake_tenseal.built[0]
+    assert list(tmp_path.iterdir()) == []